@@ -1,7 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+import asyncio
+import json
 import os
 import logging
 from pathlib import Path
@@ -14,6 +18,8 @@ import sqlite3
 import pandas as pd
 import threading
 import time
+import concurrent.futures
+import multiprocessing
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -89,6 +95,252 @@ class FraudAlert(BaseModel):
     timestamp: str
     status: str
 
+class ReportRun(BaseModel):
+    version: int
+    status: str
+    run_type: str
+    started_at: str
+    completed_at: Optional[str] = None
+    months_refreshed: int = 0
+    snapshot_count: int = 0
+
+class EventSinkStats(BaseModel):
+    queued: int
+    written: int
+    dropped: int
+    failed: int
+    batches: int
+    retries: int
+
+# Write-behind event sink for MongoDB audit data
+class MongoEventSink:
+    """Buffers write operations and flushes them to MongoDB in batches.
+
+    Handlers call ``emit`` (or ``emit_threadsafe`` from worker threads) which
+    only appends to a bounded in-memory buffer, so no request ever awaits a
+    database round trip; when the buffer is full those events are dropped.
+    Producers that can afford to wait use ``put`` (or ``put_threadsafe``)
+    instead, which blocks until the buffer has space. A background task flushes the buffer with
+    ``bulk_write`` whenever ``batch_size`` operations are pending or
+    ``flush_interval`` seconds have passed, retrying failed batches with
+    exponential backoff. ``database`` only needs to support
+    ``database[name].bulk_write(ops, ordered=False)``, so tests can pass an
+    in-process stand-in instead of a Motor database.
+    """
+
+    def __init__(self, database, batch_size=500, flush_interval=2.0,
+                 max_queue_size=10000, max_retries=3, retry_backoff=0.5,
+                 shutdown_timeout=10.0, drop_warning_interval=60.0):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.drop_warning_interval = drop_warning_interval
+        self._buffer = []
+        self._in_flight = 0
+        self._loop = None
+        self._task = None
+        self._ready = None
+        self._not_full = None
+        self._stopping = False
+        self._last_drop_warning = None
+        self._dropped_since_warning = 0
+        self._stats = {'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0, 'retries': 0}
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still buffered and stop the background task.
+
+        Whatever has not been written after ``shutdown_timeout`` seconds is
+        counted as failed and discarded.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._ready.set()
+        # Wake producers waiting in put() so they give up instead of hanging
+        self._not_full.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            lost = self._in_flight + len(self._buffer)
+            self._stats['failed'] += lost
+            self._buffer.clear()
+            self._in_flight = 0
+            logger.error(f"Event sink shutdown timed out, discarding {lost} events")
+        finally:
+            self._task = None
+
+    def emit(self, collection: str, operation) -> bool:
+        """Queue a document (inserted) or pymongo write op without blocking.
+
+        Returns False and counts the event as dropped when the buffer is full.
+        """
+        if self._task is None or self._stopping or len(self._buffer) >= self.max_queue_size:
+            self._record_drop(collection)
+            return False
+        if isinstance(operation, dict):
+            operation = InsertOne(operation)
+        self._buffer.append((collection, operation))
+        if len(self._buffer) >= self.max_queue_size:
+            self._not_full.clear()
+        if len(self._buffer) >= self.batch_size:
+            self._ready.set()
+        return True
+
+    async def put(self, collection: str, operation) -> bool:
+        """Queue an operation, waiting for buffer space instead of dropping it."""
+        while self._task is not None and not self._stopping and len(self._buffer) >= self.max_queue_size:
+            await self._not_full.wait()
+        return self.emit(collection, operation)
+
+    def emit_threadsafe(self, collection: str, operation) -> bool:
+        """Hand an operation to the event loop from another thread without blocking.
+
+        Returns False only if the loop is gone; whether ``emit`` then accepts
+        the operation is not reported back.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._record_drop(collection)
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self.emit, collection, operation)
+        except RuntimeError:
+            # The loop closed between the check and the call
+            self._record_drop(collection)
+            return False
+        return True
+
+    def put_threadsafe(self, collection: str, operation, timeout=30.0) -> bool:
+        """Queue an operation from another thread, blocking it until there is space."""
+        if self._loop is None or self._loop.is_closed():
+            self._record_drop(collection)
+            return False
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.put(collection, operation), self._loop)
+        except RuntimeError:
+            self._record_drop(collection)
+            return False
+        try:
+            return future.result(timeout)
+        except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+            future.cancel()
+            self._record_drop(collection)
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {'queued': len(self._buffer), **self._stats}
+
+    def _record_drop(self, collection):
+        self._stats['dropped'] += 1
+        self._dropped_since_warning += 1
+        now = time.monotonic()
+        if self._last_drop_warning is None or now - self._last_drop_warning >= self.drop_warning_interval:
+            logger.warning(
+                f"Event sink dropped {self._dropped_since_warning} events "
+                f"(latest for '{collection}', {self._stats['dropped']} in total)"
+            )
+            self._last_drop_warning = now
+            self._dropped_since_warning = 0
+
+    async def _run(self):
+        while True:
+            if not self._stopping and len(self._buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._ready.clear()
+
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                self._not_full.set()
+                await self._write_batch(batch)
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    break
+
+            if self._stopping and not self._buffer:
+                return
+
+    async def _write_batch(self, batch):
+        grouped = {}
+        for collection, operation in batch:
+            grouped.setdefault(collection, []).append(operation)
+
+        self._stats['batches'] += 1
+        self._in_flight = len(batch)
+        for collection, operations in grouped.items():
+            try:
+                await self._write_group(collection, operations)
+            except Exception:
+                self._stats['failed'] += len(operations)
+                logger.exception(f"Dropping {len(operations)} events for '{collection}'")
+            self._in_flight -= len(operations)
+
+    async def _write_group(self, collection, operations):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.database[collection].bulk_write(operations, ordered=False)
+                self._stats['written'] += len(operations)
+                return
+            except BulkWriteError as exc:
+                # Duplicate keys mean an earlier attempt already landed those inserts
+                errors = exc.details.get('writeErrors', [])
+                if (errors and not exc.details.get('writeConcernErrors')
+                        and all(error.get('code') == 11000 for error in errors)):
+                    self._stats['written'] += len(operations)
+                    return
+                error = exc
+            except PyMongoError as exc:
+                error = exc
+
+            if attempt < self.max_retries:
+                self._stats['retries'] += 1
+                # Retry straight away while shutting down, the deadline bounds it
+                if not self._stopping:
+                    await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+        self._stats['failed'] += len(operations)
+        logger.error(f"Dropping {len(operations)} events for '{collection}' after {self.max_retries + 1} attempts: {error}")
+
+# Upserted event collections and the field each upsert filters on
+EVENT_INDEXES = {
+    'fraud_alerts': 'transaction_id',
+    'spark_jobs': 'job_id',
+    'report_runs': 'version'
+}
+
+async def ensure_event_indexes(timeout=10.0):
+    """Create the unique indexes the sink's upserts rely on."""
+    try:
+        await asyncio.wait_for(asyncio.gather(*[
+            db[collection].create_index(field, unique=True)
+            for collection, field in EVENT_INDEXES.items()
+        ]), timeout=timeout)
+    except (asyncio.TimeoutError, PyMongoError):
+        logger.exception("Could not create event sink indexes")
+
+event_sink = MongoEventSink(
+    db,
+    batch_size=int(os.environ.get('EVENT_SINK_BATCH_SIZE', 500)),
+    flush_interval=float(os.environ.get('EVENT_SINK_FLUSH_INTERVAL', 2.0)),
+    max_queue_size=int(os.environ.get('EVENT_SINK_MAX_QUEUE', 10000)),
+    shutdown_timeout=float(os.environ.get('EVENT_SINK_SHUTDOWN_TIMEOUT', 10.0)),
+)
+
 # Initialize database
 def init_database():
     conn = sqlite3.connect(str(DB_PATH))
@@ -122,6 +374,75 @@ def init_database():
         )
     ''')
     
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions (timestamp)')
+    
+    # Report engine tables: monthly aggregates, run history and versioned snapshots
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_aggregates (
+            month TEXT,
+            customer_id TEXT,
+            category TEXT,
+            inflow REAL,
+            outflow REAL,
+            txn_count INTEGER,
+            PRIMARY KEY (month, customer_id, category)
+        )
+    ''')
+    
+    # Months whose aggregates are stale; maintained by triggers on transactions
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'report_dirty_months'")
+    seed_dirty_months = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_dirty_months (
+            month TEXT PRIMARY KEY
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_dirty_insert AFTER INSERT ON transactions
+        BEGIN
+            INSERT OR IGNORE INTO report_dirty_months VALUES (substr(NEW.timestamp, 1, 7));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_dirty_update AFTER UPDATE ON transactions
+        BEGIN
+            INSERT OR IGNORE INTO report_dirty_months VALUES (substr(OLD.timestamp, 1, 7));
+            INSERT OR IGNORE INTO report_dirty_months VALUES (substr(NEW.timestamp, 1, 7));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_dirty_delete AFTER DELETE ON transactions
+        BEGIN
+            INSERT OR IGNORE INTO report_dirty_months VALUES (substr(OLD.timestamp, 1, 7));
+        END
+    ''')
+    if seed_dirty_months:
+        # Rows written before the triggers existed have never been aggregated
+        cursor.execute('INSERT OR IGNORE INTO report_dirty_months SELECT DISTINCT substr(timestamp, 1, 7) FROM transactions')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_runs (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            status TEXT,
+            run_type TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            months_refreshed INTEGER DEFAULT 0,
+            snapshot_count INTEGER DEFAULT 0
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_snapshots (
+            version INTEGER,
+            report_type TEXT,
+            scope_type TEXT,
+            scope_key TEXT,
+            payload TEXT,
+            PRIMARY KEY (version, report_type, scope_type, scope_key)
+        )
+    ''')
+    
     conn.commit()
     
     # Check if data exists
@@ -198,6 +519,7 @@ def simulate_spark_job():
         'duration': None
     }
     active_spark_jobs.append(job)
+    record_spark_job(job)
     
     # Simulate job progress
     for i in range(10):
@@ -206,6 +528,372 @@ def simulate_spark_job():
     
     job['status'] = 'completed'
     job['duration'] = 10.0
+    record_spark_job(job)
+
+def record_spark_job(job):
+    # Runs on the simulation thread, which can afford to wait for buffer space
+    event_sink.put_threadsafe('spark_jobs', UpdateOne(
+        {'job_id': job['job_id']},
+        {'$set': {**job, 'updated_at': datetime.now(timezone.utc).isoformat()}},
+        upsert=True
+    ))
+
+# Report engine
+# Reports are computed from monthly aggregates in scheduled batch runs and stored
+# as versioned snapshots, so /api/reports/* never scans raw transactions.
+REPORT_INTERVAL = int(os.environ.get('REPORT_INTERVAL_SECONDS', 3600))
+REPORT_RETENTION = int(os.environ.get('REPORT_RETENTION', 10))
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', min(4, os.cpu_count() or 1)))
+REPORT_PARTITION_SIZE = 100
+BURN_RATE_MONTHS = 3
+
+# Scope type -> column of the aggregate frame it groups by
+REPORT_SCOPES = {
+    'overall': 'overall',
+    'segment': 'segment',
+    'category': 'category',
+    'customer': 'customer_id'
+}
+
+report_run_lock = threading.Lock()
+
+def month_range(start_month, end_month):
+    return [str(period) for period in pd.period_range(start_month, end_month, freq='M')]
+
+def refresh_monthly_aggregates(conn, start_month, end_month, chunk_months=12):
+    """Rebuild monthly aggregates for an inclusive month range, one chunk at a time.
+
+    Each chunk is a single range scan over the timestamp index committed on its
+    own, so backfills over years of data never hold one huge transaction.
+    """
+    months = month_range(start_month, end_month)
+    cursor = conn.cursor()
+    
+    for i in range(0, len(months), chunk_months):
+        chunk = months[i:i + chunk_months]
+        lower = chunk[0]
+        upper = str(pd.Period(chunk[-1], freq='M') + 1)
+        
+        cursor.execute('DELETE FROM monthly_aggregates WHERE month >= ? AND month < ?', (lower, upper))
+        cursor.execute('''
+            INSERT INTO monthly_aggregates (month, customer_id, category, inflow, outflow, txn_count)
+            SELECT
+                substr(timestamp, 1, 7) as month,
+                customer_id,
+                category,
+                SUM(CASE WHEN transaction_type = 'credit' THEN amount ELSE 0 END),
+                SUM(CASE WHEN transaction_type = 'debit' THEN amount ELSE 0 END),
+                COUNT(*)
+            FROM transactions
+            WHERE timestamp >= ? AND timestamp < ?
+            GROUP BY month, customer_id, category
+        ''', (lower, upper))
+        conn.commit()
+    
+    return len(months)
+
+def update_monthly_aggregates(conn):
+    """Incrementally refresh the months marked stale since the last run.
+
+    Triggers on ``transactions`` record the month of every inserted, updated or
+    deleted row, so late-posted, backdated and removed rows are all picked up.
+    """
+    cursor = conn.cursor()
+    cursor.execute('SELECT month FROM report_dirty_months ORDER BY month')
+    months = [row[0] for row in cursor.fetchall()]
+    if not months:
+        return 0
+    
+    # Clear the marks first so changes landing during the refresh mark the month again
+    cursor.executemany('DELETE FROM report_dirty_months WHERE month = ?', [(month,) for month in months])
+    conn.commit()
+    try:
+        for month in months:
+            refresh_monthly_aggregates(conn, month, month)
+    except Exception:
+        cursor.executemany('INSERT OR IGNORE INTO report_dirty_months VALUES (?)', [(month,) for month in months])
+        conn.commit()
+        raise
+    return len(months)
+
+def clean_metric(value):
+    if value is None or pd.isna(value) or value in (float('inf'), float('-inf')):
+        return None
+    return round(float(value), 2)
+
+def growth_rate(current, previous):
+    if pd.isna(previous) or previous == 0:
+        return None
+    return clean_metric((current - previous) / previous * 100)
+
+def build_scope_reports(monthly, balance, partial_month=None):
+    """Build cash flow, budget and trend payloads from a scope's monthly series.
+
+    ``partial_month`` is the month still in progress. It is listed with
+    ``partial: True`` but left out of burn rate, budget variance and growth,
+    which would otherwise compare a few days against full months.
+    """
+    inflow = monthly['inflow']
+    outflow = monthly['outflow']
+    volume = inflow + outflow
+    complete = monthly.index != partial_month
+    
+    # Burn rate is the average net outflow over the trailing complete months
+    burn_rate = (outflow - inflow).clip(lower=0)[complete].tail(BURN_RATE_MONTHS).mean()
+    runway = balance / burn_rate if balance is not None and burn_rate > 0 else None
+    
+    # No budgets are stored, so each month is budgeted at the trailing average spend
+    budget = outflow[complete].shift(1).rolling(BURN_RATE_MONTHS, min_periods=1).mean()
+    budget = budget.reindex(monthly.index)
+    if partial_month in monthly.index:
+        budget[partial_month] = outflow[complete].tail(BURN_RATE_MONTHS).mean()
+    
+    cash_flow = {
+        'months': [{
+            'month': month,
+            'partial': month == partial_month,
+            'inflow': clean_metric(inflow[month]),
+            'outflow': clean_metric(outflow[month]),
+            'net_cash_flow': clean_metric(inflow[month] - outflow[month]),
+            'txn_count': int(monthly['txn_count'][month])
+        } for month in monthly.index],
+        'burn_rate': clean_metric(burn_rate),
+        'balance': clean_metric(balance),
+        'runway_months': clean_metric(runway)
+    }
+    
+    budget_report = {
+        'months': [{
+            'month': month,
+            'partial': month == partial_month,
+            'budget': clean_metric(budget[month]),
+            'actual': clean_metric(outflow[month]),
+            'variance': None if month == partial_month else clean_metric(outflow[month] - budget[month]),
+            'variance_pct': None if month == partial_month else growth_rate(outflow[month], budget[month])
+        } for month in monthly.index]
+    }
+    
+    trend_months = []
+    for i, month in enumerate(monthly.index):
+        partial = month == partial_month
+        trend_months.append({
+            'month': month,
+            'partial': partial,
+            'volume': clean_metric(volume.iloc[i]),
+            'mom_growth': growth_rate(volume.iloc[i], volume.iloc[i - 1]) if i >= 1 and not partial else None,
+            'yoy_growth': growth_rate(volume.iloc[i], volume.iloc[i - 12]) if i >= 12 and not partial else None
+        })
+    
+    latest = [entry for entry in trend_months if not entry['partial']]
+    trends = {
+        'months': trend_months,
+        'latest_mom_growth': latest[-1]['mom_growth'] if latest else None,
+        'latest_yoy_growth': latest[-1]['yoy_growth'] if latest else None
+    }
+    
+    return {'cash_flow': cash_flow, 'budget': budget_report, 'trends': trends}
+
+def compute_scope_reports(monthly, months, scope, balances, partial_month=None):
+    """Build report payloads for one partition of a scope's keys.
+
+    Runs in a worker process, so it only receives the partition's slice of the
+    ``(key, month)`` aggregates and the balances for those keys.
+    """
+    snapshots = []
+    for key, group in monthly.groupby(level=0):
+        series = group.droplevel(0).reindex(months, fill_value=0)
+        reports = build_scope_reports(series, balances.get(key), partial_month)
+        for report_type, payload in reports.items():
+            snapshots.append((report_type, scope, key, payload))
+    return snapshots
+
+def build_report_snapshots(conn):
+    frame = pd.read_sql_query('''
+        SELECT a.month, a.customer_id, a.category, a.inflow, a.outflow, a.txn_count, c.segment
+        FROM monthly_aggregates a
+        LEFT JOIN customers c ON c.id = a.customer_id
+    ''', conn)
+    if frame.empty:
+        return []
+    
+    customers = pd.read_sql_query('SELECT id, segment, account_balance FROM customers', conn)
+    balances = {
+        'overall': {'all': customers['account_balance'].sum()},
+        'segment': customers.groupby('segment')['account_balance'].sum().to_dict(),
+        'category': {},
+        'customer': customers.set_index('id')['account_balance'].to_dict()
+    }
+    
+    frame['overall'] = 'all'
+    months = month_range(frame['month'].min(), frame['month'].max())
+    
+    # The month holding the latest transaction stays partial until a later month has data
+    partial_month = conn.execute('SELECT MAX(timestamp) FROM transactions').fetchone()[0][:7]
+    
+    # Group each scope once, then build the per-key payloads (pure Python, GIL-bound)
+    # for partitions of keys in worker processes. Spawned workers avoid forking a
+    # process that is running an event loop and other threads.
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=REPORT_WORKERS, mp_context=context) as executor:
+        futures = []
+        for scope, column in REPORT_SCOPES.items():
+            monthly = frame.groupby([column, 'month'])[['inflow', 'outflow', 'txn_count']].sum()
+            keys = list(monthly.index.get_level_values(0).unique())
+            for i in range(0, len(keys), REPORT_PARTITION_SIZE):
+                partition = keys[i:i + REPORT_PARTITION_SIZE]
+                futures.append(executor.submit(
+                    compute_scope_reports, monthly.loc[partition], months, scope,
+                    {key: balances[scope].get(key) for key in partition}, partial_month
+                ))
+        
+        snapshots = []
+        for future in futures:
+            snapshots.extend(future.result())
+    return snapshots
+
+def run_report_batch(run_type='scheduled', backfill=None, lock_held=False):
+    """Refresh aggregates and store a new snapshot version.
+
+    ``backfill`` is an optional ``(start_month, end_month, chunk_months)`` tuple
+    recomputed before the incremental refresh. Returns the new version, or None
+    if another run already holds the lock. With ``lock_held`` the caller has
+    already acquired ``report_run_lock`` and this run releases it.
+    """
+    if not lock_held and not report_run_lock.acquire(blocking=False):
+        return None
+    
+    conn = None
+    try:
+        conn = sqlite3.connect(str(DB_PATH))
+        cursor = conn.cursor()
+        run = {
+            'status': 'running',
+            'run_type': run_type,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'completed_at': None,
+            'months_refreshed': 0,
+            'snapshot_count': 0
+        }
+        cursor.execute(
+            'INSERT INTO report_runs (status, run_type, started_at) VALUES (?, ?, ?)',
+            (run['status'], run['run_type'], run['started_at'])
+        )
+        run['version'] = cursor.lastrowid
+        conn.commit()
+        
+        try:
+            if backfill:
+                run['months_refreshed'] += refresh_monthly_aggregates(conn, *backfill)
+            run['months_refreshed'] += update_monthly_aggregates(conn)
+            
+            snapshots = build_report_snapshots(conn)
+            cursor.executemany(
+                'INSERT INTO report_snapshots VALUES (?,?,?,?,?)',
+                [(run['version'], report_type, scope, key, json.dumps(payload))
+                 for report_type, scope, key, payload in snapshots]
+            )
+            run['status'] = 'completed'
+            run['snapshot_count'] = len(snapshots)
+        except Exception:
+            conn.rollback()
+            run['status'] = 'failed'
+            logger.exception(f"Report run {run['version']} failed")
+        
+        run['completed_at'] = datetime.now(timezone.utc).isoformat()
+        cursor.execute(
+            'UPDATE report_runs SET status = ?, completed_at = ?, months_refreshed = ?, snapshot_count = ? WHERE version = ?',
+            (run['status'], run['completed_at'], run['months_refreshed'], run['snapshot_count'], run['version'])
+        )
+        
+        # Keep only the most recent completed versions; older ones are expired
+        cursor.execute('''
+            UPDATE report_runs SET status = 'expired'
+            WHERE status = 'completed' AND version NOT IN (
+                SELECT version FROM report_runs WHERE status = 'completed'
+                ORDER BY version DESC LIMIT ?
+            )
+        ''', (REPORT_RETENTION,))
+        cursor.execute('''
+            DELETE FROM report_snapshots WHERE version NOT IN (
+                SELECT version FROM report_runs WHERE status = 'completed'
+            )
+        ''')
+        conn.commit()
+        
+        event_sink.put_threadsafe('report_runs', UpdateOne(
+            {'version': run['version']}, {'$set': run}, upsert=True
+        ))
+        return run['version']
+    finally:
+        if conn is not None:
+            conn.close()
+        report_run_lock.release()
+
+def start_report_run(run_type, backfill=None):
+    """Start a run in a background thread; returns False if one is already running."""
+    if not report_run_lock.acquire(blocking=False):
+        return False
+    try:
+        threading.Thread(target=run_report_batch, args=(run_type, backfill, True), daemon=True).start()
+    except Exception:
+        report_run_lock.release()
+        raise
+    return True
+
+def report_scheduler():
+    while True:
+        try:
+            run_report_batch()
+        except Exception:
+            logger.exception("Scheduled report run failed")
+        time.sleep(REPORT_INTERVAL)
+
+def load_report_snapshot(report_type, scope, key, version, limit):
+    if scope not in REPORT_SCOPES:
+        raise HTTPException(status_code=400, detail=f"Unknown scope '{scope}'")
+    
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+    
+    if version is None:
+        cursor.execute('''
+            SELECT version, completed_at FROM report_runs
+            WHERE status = 'completed'
+            ORDER BY version DESC
+            LIMIT 1
+        ''')
+    else:
+        cursor.execute(
+            "SELECT version, completed_at FROM report_runs WHERE status = 'completed' AND version = ?",
+            (version,)
+        )
+    run = cursor.fetchone()
+    if run is None:
+        conn.close()
+        raise HTTPException(status_code=404, detail='No report snapshot available')
+    
+    query = 'SELECT scope_key, payload FROM report_snapshots WHERE version = ? AND report_type = ? AND scope_type = ?'
+    params = [run[0], report_type, scope]
+    if key is not None:
+        query += ' AND scope_key = ?'
+        params.append(key)
+    query += ' ORDER BY scope_key LIMIT ?'
+    params.append(limit)
+    
+    cursor.execute(query, params)
+    reports = [{'scope_key': row[0], **json.loads(row[1])} for row in cursor.fetchall()]
+    conn.close()
+    
+    if key is not None and not reports:
+        raise HTTPException(status_code=404, detail=f"No {scope} report for '{key}'")
+    
+    return {
+        'version': run[0],
+        'generated_at': run[1],
+        'report_type': report_type,
+        'scope': scope,
+        'reports': reports
+    }
 
 # API Routes
 @api_router.get("/dashboard/stats", response_model=DashboardStats)
@@ -306,6 +994,24 @@ async def get_fraud_alerts():
         ))
     
     conn.close()
+    
+    seen_at = datetime.now(timezone.utc).isoformat()
+    for alert in alerts:
+        event_sink.emit('fraud_alerts', UpdateOne(
+            {'transaction_id': alert.transaction_id},
+            {
+                '$set': {
+                    'customer_id': alert.customer_id,
+                    'amount': alert.amount,
+                    'fraud_score': alert.fraud_score,
+                    'reason': alert.reason,
+                    'timestamp': alert.timestamp,
+                    'last_seen': seen_at
+                },
+                '$setOnInsert': {'status': alert.status, 'first_seen': seen_at}
+            },
+            upsert=True
+        ))
     return alerts
 
 @api_router.get("/customers", response_model=List[Customer])
@@ -394,11 +1100,95 @@ async def trigger_spark_job(job_name: str):
     threading.Thread(target=simulate_spark_job, daemon=True).start()
     return {'message': f'Spark job "{job_name}" triggered successfully'}
 
+@api_router.get("/reports/cash-flow")
+async def get_cash_flow_report(scope: str = 'overall', key: Optional[str] = None,
+                               version: Optional[int] = None, limit: int = 100):
+    return load_report_snapshot('cash_flow', scope, key, version, limit)
+
+@api_router.get("/reports/budget")
+async def get_budget_report(scope: str = 'overall', key: Optional[str] = None,
+                            version: Optional[int] = None, limit: int = 100):
+    return load_report_snapshot('budget', scope, key, version, limit)
+
+@api_router.get("/reports/trends")
+async def get_trends_report(scope: str = 'overall', key: Optional[str] = None,
+                            version: Optional[int] = None, limit: int = 100):
+    return load_report_snapshot('trends', scope, key, version, limit)
+
+@api_router.get("/reports/runs", response_model=List[ReportRun])
+async def get_report_runs(limit: int = 20):
+    conn = sqlite3.connect(str(DB_PATH))
+    df = pd.read_sql_query('SELECT * FROM report_runs ORDER BY version DESC LIMIT ?', conn, params=(limit,))
+    conn.close()
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+@api_router.post("/reports/run")
+async def trigger_report_run():
+    if not start_report_run('manual'):
+        raise HTTPException(status_code=409, detail='A report run is already in progress')
+    return {'message': 'Report run triggered successfully'}
+
+@api_router.post("/reports/recompute")
+async def trigger_report_recompute(start_month: str, end_month: str, chunk_months: int = 12):
+    try:
+        start, end = pd.Period(start_month, freq='M'), pd.Period(end_month, freq='M')
+    except ValueError:
+        start = end = None
+    # Empty strings and 'NaT' parse to NaT instead of raising
+    if start is None or pd.isna(start) or pd.isna(end):
+        raise HTTPException(status_code=400, detail='Months must be formatted as YYYY-MM')
+    if start > end or chunk_months < 1:
+        raise HTTPException(status_code=400, detail='Invalid recompute range')
+    
+    # Clamp the backfill to months that actually hold transactions
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+    cursor.execute('SELECT MIN(timestamp), MAX(timestamp) FROM transactions')
+    first, last = cursor.fetchone()
+    conn.close()
+    if first is None:
+        raise HTTPException(status_code=400, detail='No transactions to recompute')
+    first, last = first[:7], last[:7]
+    start = max(start, pd.Period(first, freq='M'))
+    end = min(end, pd.Period(last, freq='M'))
+    if start > end:
+        raise HTTPException(status_code=400, detail=f'Recompute range has no transactions ({first} to {last})')
+    
+    backfill = (str(start), str(end), chunk_months)
+    if not start_report_run('backfill', backfill):
+        raise HTTPException(status_code=409, detail='A report run is already in progress')
+    return {'message': f'Recompute of {start} to {end} triggered successfully'}
+
+@api_router.get("/events/sink", response_model=EventSinkStats)
+async def get_event_sink_stats():
+    return EventSinkStats(**event_sink.stats())
+
+# Record API access events without awaiting MongoDB in the request path
+@app.middleware("http")
+async def audit_api_access(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    if request.url.path.startswith('/api'):
+        event_sink.emit('api_access_log', {
+            'method': request.method,
+            'path': request.url.path,
+            'query': str(request.url.query),
+            'status_code': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'client': request.client.host if request.client else None,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
+    return response
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
     init_database()
     logger.info("Database initialized")
+    await ensure_event_indexes()
+    event_sink.start()
+    logger.info("Event sink started")
+    threading.Thread(target=report_scheduler, daemon=True).start()
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -420,7 +1210,13 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    # Flush buffered audit events before the Mongo client goes away
+    try:
+        await event_sink.stop()
+    except Exception:
+        logger.exception("Event sink failed to stop cleanly")
+    finally:
+        client.close()
     # Spark cleanup if initialized
     global spark
     if spark:
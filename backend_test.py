@@ -158,6 +158,41 @@ class BankingDashboardTester:
         print(f"Cloud status validation: {data}")
         return True
 
+    def validate_report_snapshot(self, data):
+        """Validate a precomputed report snapshot"""
+        required_fields = ['version', 'generated_at', 'report_type', 'scope', 'reports']
+        
+        for field in required_fields:
+            if field not in data:
+                print(f"Missing report field: {field}")
+                return False
+        
+        if len(data['reports']) == 0:
+            print("No reports in snapshot")
+            return False
+        
+        if 'months' not in data['reports'][0]:
+            print("Report is missing monthly series")
+            return False
+        
+        print(f"Report validation: version {data['version']}, {len(data['reports'])} {data['scope']} reports")
+        return True
+
+    def validate_event_sink_stats(self, data):
+        """Validate event sink counters"""
+        required_fields = ['queued', 'written', 'dropped', 'failed', 'batches', 'retries']
+        
+        for field in required_fields:
+            if field not in data:
+                print(f"Missing event sink field: {field}")
+                return False
+            if not isinstance(data[field], int) or data[field] < 0:
+                print(f"Invalid event sink counter {field}: {data[field]}")
+                return False
+        
+        print(f"Event sink validation: {data}")
+        return True
+
 def main():
     print("🏦 Banking Analytics Dashboard API Testing")
     print("=" * 50)
@@ -250,6 +285,41 @@ def main():
         200
     )
     
+    print("\n📑 Testing Report Runs...")
+    tester.run_test(
+        "Report Runs",
+        "GET",
+        "api/reports/runs",
+        200
+    )
+    
+    for report, scope in [('cash-flow', 'overall'), ('budget', 'category'), ('trends', 'segment')]:
+        print(f"\n📑 Testing {report} Report ({scope})...")
+        tester.run_test(
+            f"Report {report} ({scope})",
+            "GET",
+            f"api/reports/{report}?scope={scope}",
+            200,
+            validate_func=tester.validate_report_snapshot
+        )
+    
+    print("\n📑 Testing Report Recompute...")
+    tester.run_test(
+        "Report Recompute Invalid Range",
+        "POST",
+        "api/reports/recompute?start_month=2025-06&end_month=2025-01",
+        400
+    )
+    
+    print("\n🗄️ Testing Event Sink Stats...")
+    tester.run_test(
+        "Event Sink Stats",
+        "GET",
+        "api/events/sink",
+        200,
+        validate_func=tester.validate_event_sink_stats
+    )
+    
     # Print final results
     print("\n" + "=" * 50)
     print(f"📊 FINAL RESULTS")
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import threading
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from server import MongoEventSink
+
+
+class FakeCollection:
+    """In-process stand-in for a Motor collection."""
+
+    def __init__(self, failures=0, error=AutoReconnect, delay=0):
+        self.writes = []
+        self.calls = 0
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+
+    async def bulk_write(self, operations, ordered=False):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise self.error('stand-in failure')
+        self.writes.append(list(operations))
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+async def wait_until(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, 'timed out waiting for the sink'
+        await asyncio.sleep(0.005)
+
+
+def make_sink(database, **kwargs):
+    options = {'batch_size': 3, 'flush_interval': 0.05, 'max_queue_size': 10,
+               'max_retries': 2, 'retry_backoff': 0.01, 'shutdown_timeout': 1.0}
+    options.update(kwargs)
+    return MongoEventSink(database, **options)
+
+
+def test_flushes_when_batch_size_is_reached():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, flush_interval=10)
+        sink.start()
+        for i in range(3):
+            sink.emit('events', {'i': i})
+        await wait_until(lambda: sink.stats()['written'] == 3)
+        stats = sink.stats()
+        await sink.stop()
+        return database, stats
+
+    database, stats = asyncio.run(scenario())
+    assert stats['written'] == 3
+    assert stats['queued'] == 0
+    assert [len(write) for write in database['events'].writes] == [3]
+
+
+def test_flushes_when_interval_expires():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database)
+        sink.start()
+        sink.emit('events', {'i': 1})
+        before = sink.stats()['written']
+        await wait_until(lambda: sink.stats()['written'] == 1)
+        stats = sink.stats()
+        await sink.stop()
+        return before, stats
+
+    before, stats = asyncio.run(scenario())
+    assert before == 0
+    assert stats['written'] == 1
+    assert stats['queued'] == 0
+
+
+def test_drops_events_once_queue_is_full():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, batch_size=100, flush_interval=10, max_queue_size=5)
+        sink.start()
+        accepted = [sink.emit('events', {'i': i}) for i in range(8)]
+        stats = sink.stats()
+        await sink.stop()
+        return accepted, stats, sink.stats()
+
+    accepted, stats, final = asyncio.run(scenario())
+    assert accepted == [True] * 5 + [False] * 3
+    assert stats['queued'] == 5
+    assert stats['dropped'] == 3
+    assert final['written'] == 5
+
+
+def test_drops_are_logged_with_rate_limit(caplog):
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, batch_size=100, flush_interval=10, max_queue_size=1)
+        sink.start()
+        for i in range(4):
+            sink.emit('events', {'i': i})
+        await sink.stop()
+
+    with caplog.at_level(logging.WARNING, logger='server'):
+        asyncio.run(scenario())
+    warnings = [record for record in caplog.records if 'dropped' in record.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_put_waits_for_space_instead_of_dropping():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, batch_size=2, flush_interval=10, max_queue_size=2)
+        sink.start()
+        accepted = [await sink.put('events', {'i': i}) for i in range(7)]
+        await sink.stop()
+        return accepted, sink.stats()
+
+    accepted, stats = asyncio.run(scenario())
+    assert accepted == [True] * 7
+    assert stats['dropped'] == 0
+    assert stats['written'] == 7
+
+
+def test_put_threadsafe_blocks_worker_thread_until_space():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, batch_size=2, flush_interval=10, max_queue_size=2)
+        sink.start()
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.extend(sink.put_threadsafe('events', {'i': i}) for i in range(6))
+        )
+        worker.start()
+        await wait_until(lambda: not worker.is_alive())
+        await sink.stop()
+        return results, sink.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [True] * 6
+    assert stats['dropped'] == 0
+    assert stats['written'] == 6
+
+
+def test_emit_threadsafe_after_loop_closed_counts_drop():
+    async def scenario():
+        sink = make_sink(FakeDatabase())
+        sink.start()
+        await sink.stop()
+        return sink
+
+    sink = asyncio.run(scenario())
+    assert sink.emit_threadsafe('events', {'i': 1}) is False
+    assert sink.stats()['dropped'] == 1
+
+
+def test_retries_then_counts_failed():
+    async def scenario():
+        database = FakeDatabase()
+        database['flaky'] = FakeCollection(failures=1)
+        database['down'] = FakeCollection(failures=100)
+        sink = make_sink(database)
+        sink.start()
+        sink.emit('flaky', {'i': 1})
+        sink.emit('down', {'i': 2})
+        await sink.stop()
+        return database, sink.stats()
+
+    database, stats = asyncio.run(scenario())
+    assert database['flaky'].calls == 2
+    assert database['down'].calls == 3
+    assert stats['written'] == 1
+    assert stats['failed'] == 1
+    assert stats['retries'] == 3
+
+
+def test_write_concern_errors_are_retried():
+    def write_concern_error(message):
+        return BulkWriteError({'writeErrors': [], 'writeConcernErrors': [{'errmsg': message}]})
+
+    async def scenario():
+        database = FakeDatabase()
+        database['events'] = FakeCollection(failures=1, error=write_concern_error)
+        sink = make_sink(database)
+        sink.start()
+        sink.emit('events', {'i': 1})
+        await sink.stop()
+        return database, sink.stats()
+
+    database, stats = asyncio.run(scenario())
+    assert database['events'].calls == 2
+    assert stats['retries'] == 1
+    assert stats['written'] == 1
+
+
+def test_unexpected_errors_do_not_stop_the_flush_task():
+    async def scenario():
+        database = FakeDatabase()
+        database['broken'] = FakeCollection(failures=1, error=ValueError)
+        sink = make_sink(database)
+        sink.start()
+        sink.emit('broken', {'i': 1})
+        await wait_until(lambda: sink.stats()['failed'] == 1)
+        sink.emit('events', {'i': 2})
+        await wait_until(lambda: sink.stats()['written'] == 1)
+        stats = sink.stats()
+        await sink.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats['failed'] == 1
+    assert stats['written'] == 1
+
+
+def test_stop_flushes_remaining_buffer():
+    async def scenario():
+        database = FakeDatabase()
+        sink = make_sink(database, batch_size=4, flush_interval=10)
+        sink.start()
+        for i in range(7):
+            sink.emit('events', {'i': i})
+        await sink.stop()
+        return database, sink.stats()
+
+    database, stats = asyncio.run(scenario())
+    assert stats['written'] == 7
+    assert stats['queued'] == 0
+    assert sum(len(write) for write in database['events'].writes) == 7
+
+
+def test_stop_gives_up_after_shutdown_timeout():
+    async def scenario():
+        database = FakeDatabase()
+        database['slow'] = FakeCollection(delay=5)
+        sink = make_sink(database, batch_size=2, flush_interval=10, shutdown_timeout=0.1)
+        sink.start()
+        for i in range(5):
+            sink.emit('slow', {'i': i})
+        await sink.stop()
+        return sink.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['written'] == 0
+    assert stats['failed'] == 5
+    assert stats['queued'] == 0
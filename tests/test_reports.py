@@ -0,0 +1,149 @@
+import asyncio
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+import server
+
+
+@pytest.fixture
+def report_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'DB_PATH', tmp_path / 'banking_data.db')
+    server.init_database()
+    conn = sqlite3.connect(str(server.DB_PATH))
+    yield conn
+    conn.close()
+
+
+def insert_transaction(conn, txn_id, timestamp, amount, transaction_type='debit'):
+    conn.execute(
+        'INSERT INTO transactions VALUES (?,?,?,?,?,?,?,?,?)',
+        (txn_id, 'CUST000001', amount, transaction_type, 'Amazon', 'Food', timestamp, 10.0, 'Boston')
+    )
+    conn.commit()
+
+
+def aggregated_outflow(conn, month):
+    cursor = conn.execute(
+        "SELECT SUM(outflow) FROM monthly_aggregates WHERE month = ? AND customer_id = 'CUST000001'",
+        (month,)
+    )
+    return cursor.fetchone()[0]
+
+
+def test_backdated_transactions_are_reaggregated(report_db):
+    server.update_monthly_aggregates(report_db)
+    assert aggregated_outflow(report_db, '2020-03') is None
+
+    insert_transaction(report_db, 'TXNLATE1', '2020-03-15T10:00:00+00:00', 250.0)
+    refreshed = server.update_monthly_aggregates(report_db)
+
+    assert refreshed == 1
+    assert aggregated_outflow(report_db, '2020-03') == 250.0
+    assert server.update_monthly_aggregates(report_db) == 0
+
+
+def test_insert_after_deleting_newest_row_is_reaggregated(report_db):
+    server.update_monthly_aggregates(report_db)
+    newest = report_db.execute('SELECT id, rowid FROM transactions ORDER BY rowid DESC LIMIT 1').fetchone()
+    report_db.execute('DELETE FROM transactions WHERE id = ?', (newest[0],))
+    report_db.commit()
+    server.update_monthly_aggregates(report_db)
+
+    # SQLite hands the freed rowid to the next insert
+    insert_transaction(report_db, 'TXNLATE2', '2019-05-02T09:00:00+00:00', 75.0)
+    assert report_db.execute("SELECT rowid FROM transactions WHERE id = 'TXNLATE2'").fetchone()[0] == newest[1]
+
+    assert server.update_monthly_aggregates(report_db) == 1
+    assert aggregated_outflow(report_db, '2019-05') == 75.0
+
+
+def test_updates_and_deletes_invalidate_their_months(report_db):
+    insert_transaction(report_db, 'TXNMOVE', '2018-01-10T09:00:00+00:00', 40.0)
+    server.update_monthly_aggregates(report_db)
+    assert aggregated_outflow(report_db, '2018-01') == 40.0
+
+    report_db.execute("UPDATE transactions SET timestamp = '2018-02-10T09:00:00+00:00' WHERE id = 'TXNMOVE'")
+    report_db.commit()
+    assert server.update_monthly_aggregates(report_db) == 2
+    assert aggregated_outflow(report_db, '2018-01') is None
+    assert aggregated_outflow(report_db, '2018-02') == 40.0
+
+    report_db.execute("DELETE FROM transactions WHERE id = 'TXNMOVE'")
+    report_db.commit()
+    assert server.update_monthly_aggregates(report_db) == 1
+    assert aggregated_outflow(report_db, '2018-02') is None
+
+
+def test_partial_month_is_excluded_from_burn_budget_and_growth():
+    monthly = pd.DataFrame(
+        {'inflow': [0.0, 0.0, 0.0], 'outflow': [100.0, 200.0, 20.0], 'txn_count': [1, 2, 1]},
+        index=['2025-11', '2025-12', '2026-01']
+    )
+
+    reports = server.build_scope_reports(monthly, 3000.0, partial_month='2026-01')
+
+    assert reports['cash_flow']['burn_rate'] == 150.0
+    assert reports['cash_flow']['runway_months'] == 20.0
+    assert reports['cash_flow']['months'][-1]['partial'] is True
+
+    current = reports['budget']['months'][-1]
+    assert current['budget'] == 150.0
+    assert current['variance'] is None
+
+    assert reports['trends']['months'][-1]['mom_growth'] is None
+    assert reports['trends']['latest_mom_growth'] == 100.0
+
+
+def test_pruned_versions_are_expired(report_db, monkeypatch):
+    monkeypatch.setattr(server, 'REPORT_RETENTION', 1)
+
+    first = server.run_report_batch()
+    second = server.run_report_batch()
+
+    statuses = dict(report_db.execute('SELECT version, status FROM report_runs').fetchall())
+    assert statuses == {first: 'expired', second: 'completed'}
+    remaining = report_db.execute('SELECT DISTINCT version FROM report_snapshots').fetchall()
+    assert remaining == [(second,)]
+
+    with pytest.raises(server.HTTPException) as excinfo:
+        server.load_report_snapshot('cash_flow', 'overall', None, first, 10)
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.parametrize('start_month', ['', 'NaT', '2025-13'])
+def test_recompute_rejects_invalid_months(report_db, start_month):
+    with pytest.raises(server.HTTPException) as excinfo:
+        asyncio.run(server.trigger_report_recompute(start_month, '2026-01'))
+    assert excinfo.value.status_code == 400
+
+
+def test_trigger_reports_conflict_while_lock_is_held(report_db):
+    assert server.report_run_lock.acquire(blocking=False)
+    try:
+        with pytest.raises(server.HTTPException) as excinfo:
+            asyncio.run(server.trigger_report_run())
+        assert excinfo.value.status_code == 409
+    finally:
+        server.report_run_lock.release()
+
+
+def test_started_run_holds_lock_until_it_finishes(report_db, monkeypatch):
+    release = threading.Event()
+
+    def blocked_build(conn):
+        assert release.wait(10)
+        return []
+
+    monkeypatch.setattr(server, 'build_report_snapshots', blocked_build)
+
+    assert server.start_report_run('manual') is True
+    assert server.start_report_run('manual') is False
+    release.set()
+
+    assert server.report_run_lock.acquire(timeout=10)
+    server.report_run_lock.release()
+    statuses = report_db.execute('SELECT status FROM report_runs').fetchall()
+    assert statuses == [('completed',)]